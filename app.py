@@ -2,18 +2,53 @@
 NIFTY Option Chain Visualizer - Flask App for Vercel/Railway
 """
 
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, Response, request
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import io
+import hashlib
 import os
+import threading
+from cachetools import TTLCache
+from flask_compress import Compress
 from flask_cors import CORS
 
 app = Flask(__name__)
 CORS(app)
 
+# Gzip text responses; streamed bodies (the CSV download) are left alone so they keep streaming
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/csv', 'text/html']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_ALGORITHM'] = 'gzip'
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
+# Built chain frames keyed by (instrument_key, expiry_date); short TTL keeps data live
+CHAIN_CACHE = TTLCache(maxsize=64, ttl=2.0)
+CHAIN_CACHE_LOCK = threading.Lock()
+
+# Option type column: category code 0 is CE, 1 is PE
+OPTION_TYPE = pd.CategoricalDtype(['CE', 'PE'])
+
+# Shared session keeps TLS connections to Upstox warm across requests
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=50,
+    # raise_on_status=False hands the last 5xx back so it surfaces as an API Error
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+SESSION.headers['Accept'] = 'application/json'
+
+UPSTOX_CHAIN_URL = 'https://api.upstox.com/v2/option/chain'
+
+def ojsonify(obj):
+    """jsonify replacement backed by orjson; numpy arrays serialize natively"""
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
+
 # HTML Template
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -209,6 +244,8 @@ HTML_TEMPLATE = '''
 
         <div id="metrics" class="metrics" style="display: none;"></div>
         
+        <div id="status"></div>
+
         <div id="chart"></div>
         
         <div class="data-section">
@@ -238,7 +275,11 @@ HTML_TEMPLATE = '''
         });
         
         let currentData = null;
-        
+        // Intl formatters are costly to construct, so build them once instead of per cell
+        const INT_FMT = new Intl.NumberFormat('en-IN');
+        const PRICE_FMT = new Intl.NumberFormat('en-IN', {minimumFractionDigits: 2});
+        let currentRequest = null;
+
         async function fetchData() {
             const token = document.getElementById('token').value;
             const instrument = document.getElementById('instrument').value;
@@ -252,24 +293,27 @@ HTML_TEMPLATE = '''
             
             showLoading();
             
+            const requestBody = JSON.stringify({
+                token: token,
+                instrument: instrument,
+                expiry: expiry,
+                strikes: parseInt(strikes)
+            });
+
             try {
                 const response = await fetch('/api/option-chain', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
                     },
-                    body: JSON.stringify({
-                        token: token,
-                        instrument: instrument,
-                        expiry: expiry,
-                        strikes: parseInt(strikes)
-                    })
+                    body: requestBody
                 });
-                
+
                 const data = await response.json();
-                
+
                 if (data.success) {
                     currentData = data;
+                    currentRequest = requestBody;
                     displayMetrics(data.metrics);
                     displayChart(data);
                     displayDataTable(data.df);
@@ -287,7 +331,7 @@ HTML_TEMPLATE = '''
             document.getElementById('metrics').innerHTML = `
                 <div class="metric-card">
                     <div class="metric-label">Spot Price</div>
-                    <div class="metric-value">₹${metrics.spot.toLocaleString('en-IN', {minimumFractionDigits: 2})}</div>
+                    <div class="metric-value">₹${PRICE_FMT.format(metrics.spot)}</div>
                 </div>
                 <div class="metric-card">
                     <div class="metric-label">ATM Strike</div>
@@ -326,7 +370,7 @@ HTML_TEMPLATE = '''
                 title: {
                     text: `<b>${data.chart.instrument} - OPTION CHAIN OI PROFILE</b><br>` +
                           `<span style="font-size:12px">Expiry: ${data.chart.expiry_display} | ` +
-                          `Spot: ₹${data.metrics.spot.toLocaleString('en-IN', {minimumFractionDigits: 2})} | ` +
+                          `Spot: ₹${PRICE_FMT.format(data.metrics.spot)} | ` +
                           `PCR: ${data.metrics.pcr.toFixed(2)}</span>`,
                     font: {size: 16, color: '#f1f5f9'}
                 },
@@ -345,7 +389,8 @@ HTML_TEMPLATE = '''
                 paper_bgcolor: '#1e293b',
                 font: {color: '#f1f5f9'},
                 barmode: 'group',
-                hovermode: 'x unified',
+                // Unified hover labels get expensive on wide chains; fall back to closest
+                hovermode: data.chart.ce_strikes.length > 50 ? 'closest' : 'x unified',
                 showlegend: true,
                 legend: {
                     orientation: 'h',
@@ -356,7 +401,10 @@ HTML_TEMPLATE = '''
                 }
             };
             
-            Plotly.newPlot('chart', [trace1, trace2], layout);
+            // Traces are plain objects built from the server's arrays, so no
+            // figure objects are constructed or validated server-side.
+            // react behaves like newPlot the first time, then only diffs changes
+            Plotly.react('chart', [trace1, trace2], layout, {responsive: true});
         }
         
         function displayDataTable(df) {
@@ -373,28 +421,51 @@ HTML_TEMPLATE = '''
                     <tbody>
             `;
             
-            df.forEach(row => {
-                tableHTML += `
+            // df is column-major: {strike: [...], type: [...], oi: [...], ltp: [...]}
+            const rows = new Array(df.strike.length);
+            for (let i = 0; i < df.strike.length; i++) {
+                rows[i] = `
                     <tr>
-                        <td>${row.strike}</td>
-                        <td style="color: ${row.type === 'CE' ? '#00ff88' : '#ff4444'}">${row.type}</td>
-                        <td>${parseInt(row.oi).toLocaleString('en-IN')}</td>
-                        <td>₹${parseFloat(row.ltp).toLocaleString('en-IN', {minimumFractionDigits: 2})}</td>
+                        <td>${df.strike[i]}</td>
+                        <td style="color: ${df.type[i] === 'CE' ? '#00ff88' : '#ff4444'}">${df.type[i]}</td>
+                        <td>${INT_FMT.format(df.oi[i])}</td>
+                        <td>₹${PRICE_FMT.format(df.ltp[i])}</td>
                     </tr>
                 `;
-            });
-            
-            tableHTML += '</tbody></table>';
+            }
+
+            tableHTML += rows.join('') + '</tbody></table>';
             document.getElementById('dataTable').innerHTML = tableHTML;
         }
         
-        function downloadCSV() {
-            if (!currentData || !currentData.csv) {
+        async function downloadCSV() {
+            if (!currentData || !currentRequest) {
                 showError('No data available to download');
                 return;
             }
-            
-            const blob = new Blob([currentData.csv], {type: 'text/csv'});
+
+            let blob;
+            try {
+                // The CSV is built server-side on demand for the last fetched chain
+                const response = await fetch('/api/option-chain.csv', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: currentRequest
+                });
+
+                if (!(response.headers.get('Content-Type') || '').startsWith('text/csv')) {
+                    const data = await response.json();
+                    showError(data.error || 'Failed to download CSV');
+                    return;
+                }
+                blob = await response.blob();
+            } catch (error) {
+                showError('Network error: ' + error.message);
+                return;
+            }
+
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
@@ -405,19 +476,20 @@ HTML_TEMPLATE = '''
             window.URL.revokeObjectURL(url);
         }
         
+        // Status messages live outside #chart so the plot DOM survives between fetches
         function showLoading() {
-            document.getElementById('chart').innerHTML = '<div class="loading">⏳ Fetching live data...</div>';
+            document.getElementById('status').innerHTML = '<div class="loading">⏳ Fetching live data...</div>';
             document.getElementById('dataTable').innerHTML = '';
         }
-        
+
         function showError(message) {
-            const chartDiv = document.getElementById('chart');
-            chartDiv.innerHTML = `<div class="error">❌ ${message}</div>`;
+            const statusDiv = document.getElementById('status');
+            statusDiv.innerHTML = `<div class="error">❌ ${message}</div>`;
         }
-        
+
         function showSuccess(message) {
-            const chartDiv = document.getElementById('chart');
-            chartDiv.innerHTML += `<div class="success">✅ ${message}</div>`;
+            const statusDiv = document.getElementById('status');
+            statusDiv.innerHTML = `<div class="success">✅ ${message}</div>`;
         }
         
         // Auto-set expiry date
@@ -427,137 +499,246 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# Compile once at import; render_template_string would re-parse it on every hit
+HOME_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+# The default expiry is the page's only input and changes with the date,
+# so the expiry and the rendered page are rebuilt once per day
+EXPIRY_CACHE = {'date': None, 'expiry': None, 'page': None, 'etag': None}
+
 @app.route('/')
 def home():
     # Set default expiry to next Thursday
-    today = datetime.now()
-    days_ahead = 3 - today.weekday()  # Thursday = 3
-    if days_ahead <= 0:
-        days_ahead += 7
-    default_expiry = (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+    today = datetime.now().date()
+    if EXPIRY_CACHE['date'] != today:
+        days_ahead = (3 - today.weekday()) % 7 or 7  # Thursday = 3
+        expiry = (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+        page = HOME_TEMPLATE.render(default_expiry=expiry)
+        EXPIRY_CACHE.update(date=today, expiry=expiry, page=page, etag=hashlib.md5(page.encode()).hexdigest())
+
+    # The page is large and static for the day: revalidating browsers get a 304 instead of the body.
+    # Flask-Compress tags gzipped responses as "<etag>:gzip", so match on the part before the suffix
+    etag = EXPIRY_CACHE['etag']
+    if any(tag.split(':')[0] == etag for tag in request.if_none_match.as_set()):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(EXPIRY_CACHE['page'], mimetype='text/html')
+    response.set_etag(etag)
+    return response
+
+def fetch_chain(instrument_key, expiry_date, token):
+    # Request the raw chain rows from Upstox; failures raise ValueError
+    # Accept is a session default, so only the per-user Authorization is added here
+    headers = {'Authorization': 'Bearer ' + token}
+    params = {'instrument_key': instrument_key, 'expiry_date': expiry_date}
+
+    response = SESSION.get(UPSTOX_CHAIN_URL, params=params, headers=headers, timeout=30)
+
+    # The chain call doubles as the token check; no separate pre-flight round trip
+    if response.status_code in (401, 403):
+        raise ValueError('Invalid or expired access token')
+    if response.status_code != 200:
+        raise ValueError(f'API Error: {response.status_code}')
+
+    api_data = orjson.loads(response.content)
+
+    if api_data.get('status') != 'success':
+        raise ValueError('No data available')
+
+    return api_data['data']
+
+def build_chain_frame(chain):
+    # Flatten chain rows into one row per CE/PE leg and return (df, spot_price, strikes),
+    # where strikes is the sorted array of unique strikes.
+    # Only the fields used below are read; greeks and order-book fields are never flattened
+    strike_price = np.array([row.get('strike_price') for row in chain], dtype=np.float64)
+    has_data, oi, ltp = [], [], []
+    for side in ('call_options', 'put_options'):
+        market_data = [(row.get(side) or {}).get('market_data') or {} for row in chain]
+        # Legs without market_data (or with only nulls in it) are masked out
+        has_data.append(np.array([any(v is not None for v in md.values()) for md in market_data], dtype=bool))
+        oi.append(np.array([md.get('oi') or 0 for md in market_data], dtype=np.float64))
+        ltp.append(np.array([md.get('ltp') or 0 for md in market_data], dtype=np.float64))
+
+    # Interleave CE/PE per chain item in one frame, keeping only legs with data.
+    # Index strikes are whole numbers; narrower dtypes shrink the frame and the payload
+    keep = np.column_stack(has_data).ravel()
+    df = pd.DataFrame({
+        'strike': np.repeat(strike_price, 2)[keep].astype(np.int32),
+        # Built straight from integer codes so CE/PE comparisons never touch strings
+        'type': pd.Categorical.from_codes(np.tile(np.array([0, 1], dtype=np.int8), len(chain))[keep], dtype=OPTION_TYPE),
+        # Per-strike OI stays far below 2**31; totals are summed in int64 by pandas
+        'oi': np.column_stack(oi).ravel()[keep].astype(np.int32),
+        'ltp': np.column_stack(ltp).ravel()[keep].astype(np.float32)
+    })
+
+    if df.empty:
+        raise ValueError('No data after filtering')
+
+    # Spot is the same on every row, so return it as a scalar instead of a column;
+    # take it from the chain item behind the first kept leg
+    spot_price = np.float32(chain[int(keep.argmax()) // 2]['underlying_spot_price'])
+
+    return df, spot_price, np.sort(df['strike'].unique())
+
+def get_chain_frame(instrument_key, expiry_date, token):
+    # Return (df, spot_price, strikes, bodies), served from CHAIN_CACHE while fresh so
+    # repeat polls and strike-count changes skip both the HTTP call and the rebuild.
+    # bodies memoizes encoded API responses per strike count and expires with the frame.
+    # The key leaves out the token: every user sees the same market snapshot.
+    key = (instrument_key, expiry_date)
+    with CHAIN_CACHE_LOCK:
+        frame = CHAIN_CACHE.get(key)
+    if frame is not None:
+        return frame
+
+    frame = build_chain_frame(fetch_chain(instrument_key, expiry_date, token)) + ({},)
+    with CHAIN_CACHE_LOCK:
+        CHAIN_CACHE[key] = frame
+    return frame
+
+def atm_window(strikes, spot, num_strikes):
+    # Return (atm_index, start_idx, end_idx) into sorted `strikes` for a window of
+    # num_strikes centred on ATM and shifted inward at either edge; num_strikes <= 0 keeps all
+    # strikes is sorted: binary-search the insertion point, then take the nearer neighbour
+    # (the lower one on a tie, as argmin over the distances would)
+    atm_index = int(np.searchsorted(strikes, spot))
+    if atm_index == len(strikes) or (atm_index > 0 and spot - strikes[atm_index - 1] <= strikes[atm_index] - spot):
+        atm_index -= 1
+    if num_strikes <= 0:
+        return atm_index, 0, len(strikes)
+
+    strikes_each_side = num_strikes // 2
+
+    start_idx = max(0, atm_index - strikes_each_side)
+    end_idx = min(len(strikes), atm_index + strikes_each_side + 1)
+
+    if start_idx == 0:
+        end_idx = min(len(strikes), num_strikes)
+    elif end_idx == len(strikes):
+        start_idx = max(0, len(strikes) - num_strikes)
+
+    return atm_index, start_idx, end_idx
+
+def select_strike_window(frame, num_strikes):
+    # Return (df, spot_price, atm_strike) for the strike window around ATM.
+    # The frame may be the cached one shared between requests, so never modify it in place
+    df, spot_price, strikes, _ = frame
+
+    # Locate ATM once; the strike window always contains it
+    atm_index, start_idx, end_idx = atm_window(strikes, spot_price, num_strikes)
+    atm_strike = strikes[atm_index]
+
+    # Filter strikes around ATM; skip the copy when the window spans every strike
+    if start_idx > 0 or end_idx < len(strikes):
+        # The window is a contiguous slice of sorted strikes, so a range check suffices
+        lo, hi = strikes[start_idx], strikes[end_idx - 1]
+        strike_values = df['strike'].values
+        df = df[(strike_values >= lo) & (strike_values <= hi)]
+
+    return df, spot_price, atm_strike
+
+def build_chain_payload(frame, instrument_key, expiry_date, num_strikes):
+    # Assemble the metrics, chart arrays and table for /api/option-chain
+    df, spot_price, atm_strike = select_strike_window(frame, num_strikes)
+
+    # Prepare chart data: one sort by (type, strike), then split at the first PE row
+    df_sorted = df.sort_values(['type', 'strike'], kind='mergesort')
+    split = df_sorted['type'].searchsorted('PE')
+    ce_df = df_sorted.iloc[:split]
+    pe_df = df_sorted.iloc[split:]
+
+    total_ce_oi = ce_df['oi'].sum()
+    total_pe_oi = pe_df['oi'].sum()
+    pcr = total_pe_oi / total_ce_oi if total_ce_oi > 0 else 0
+    
+    instrument_name = "NIFTY 50" if "Nifty 50" in instrument_key else "BANKNIFTY"
+    expiry_display = datetime.strptime(expiry_date, '%Y-%m-%d').strftime('%d %b %Y')
+    
+    return {
+        'success': True,
+        'metrics': {
+            'spot': spot_price,
+            'atm': atm_strike,
+            'total_ce': total_ce_oi,
+            'total_pe': total_pe_oi,
+            'pcr': pcr
+        },
+        # Plain arrays only; the browser builds the Plotly traces itself
+        'chart': {
+            'ce_strikes': ce_df['strike'].to_numpy(),
+            'ce_oi': ce_df['oi'].to_numpy(),
+            'pe_strikes': pe_df['strike'].to_numpy(),
+            'pe_oi': pe_df['oi'].to_numpy(),
+            'instrument': instrument_name,
+            'expiry_display': expiry_display
+        },
+        # Column-major table: one array per column instead of a dict per row
+        'df': {
+            'strike': df['strike'].to_numpy(),
+            'type': df['type'].tolist(),
+            'oi': df['oi'].to_numpy(),
+            'ltp': df['ltp'].to_numpy()
+        }
+    }
+
+def parse_chain_request():
+    # Pull the option chain parameters out of the JSON request body
+    data = request.json
+    token = data.get('token')
+    instrument_key = data.get('instrument')
+    expiry_date = data.get('expiry')
+    num_strikes = data.get('strikes', 20)
     
-    return render_template_string(HTML_TEMPLATE, default_expiry=default_expiry)
+    if not all([token, instrument_key, expiry_date]):
+        raise ValueError('Missing parameters')
+    
+    return token, instrument_key, expiry_date, num_strikes
 
 @app.route('/api/option-chain', methods=['POST'])
 def get_option_chain():
     try:
-        data = request.json
-        token = data.get('token')
-        instrument_key = data.get('instrument')
-        expiry_date = data.get('expiry')
-        num_strikes = data.get('strikes', 20)
-        
-        if not all([token, instrument_key, expiry_date]):
-            return jsonify({'success': False, 'error': 'Missing parameters'})
-        
-        # Fetch from Upstox API
-        headers = {'Accept': 'application/json', 'Authorization': f'Bearer {token}'}
-        url = 'https://api.upstox.com/v2/option/chain'
-        params = {'instrument_key': instrument_key, 'expiry_date': expiry_date}
-        
-        response = requests.get(url, params=params, headers=headers, timeout=30)
-        
-        if response.status_code != 200:
-            return jsonify({'success': False, 'error': f'API Error: {response.status_code}'})
-        
-        api_data = response.json()
-        
-        if api_data.get('status') != 'success':
-            return jsonify({'success': False, 'error': 'No data available'})
-        
-        # Process data
-        rows = []
-        for item in api_data['data']:
-            strike = item['strike_price']
-            spot = item['underlying_spot_price']
-            
-            if item.get('call_options') and item['call_options'].get('market_data'):
-                call = item['call_options']['market_data']
-                rows.append({
-                    'strike': strike, 'type': 'CE',
-                    'oi': call.get('oi', 0), 'ltp': call.get('ltp', 0),
-                    'underlying': spot
-                })
-            
-            if item.get('put_options') and item['put_options'].get('market_data'):
-                put = item['put_options']['market_data']
-                rows.append({
-                    'strike': strike, 'type': 'PE',
-                    'oi': put.get('oi', 0), 'ltp': put.get('ltp', 0),
-                    'underlying': spot
-                })
-        
-        df = pd.DataFrame(rows)
-        
-        # Filter strikes around ATM
-        if not df.empty and num_strikes > 0:
-            spot = df['underlying'].iloc[0]
-            unique_strikes = sorted(df['strike'].unique())
-            atm_strike = min(unique_strikes, key=lambda x: abs(x - spot))
-            
-            atm_index = unique_strikes.index(atm_strike)
-            strikes_each_side = num_strikes // 2
-            
-            start_idx = max(0, atm_index - strikes_each_side)
-            end_idx = min(len(unique_strikes), atm_index + strikes_each_side + 1)
-            
-            if start_idx == 0:
-                end_idx = min(len(unique_strikes), num_strikes)
-            elif end_idx == len(unique_strikes):
-                start_idx = max(0, len(unique_strikes) - num_strikes)
-            
-            filtered_strikes = unique_strikes[start_idx:end_idx]
-            df = df[df['strike'].isin(filtered_strikes)]
-        
-        if df.empty:
-            return jsonify({'success': False, 'error': 'No data after filtering'})
-        
-        # Prepare chart data
-        ce_df = df[df['type'] == 'CE'].sort_values('strike')
-        pe_df = df[df['type'] == 'PE'].sort_values('strike')
-        
-        spot_price = df['underlying'].iloc[0]
-        atm_strike = min(df['strike'].unique(), key=lambda x: abs(x - spot_price))
-        
-        total_ce_oi = ce_df['oi'].sum()
-        total_pe_oi = pe_df['oi'].sum()
-        pcr = total_pe_oi / total_ce_oi if total_ce_oi > 0 else 0
-        
-        instrument_name = "NIFTY 50" if "Nifty 50" in instrument_key else "BANKNIFTY"
-        expiry_display = datetime.strptime(expiry_date, '%Y-%m-%d').strftime('%d %b %Y')
-        
-        # Create CSV
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        csv_data = csv_buffer.getvalue()
+        token, instrument_key, expiry_date, num_strikes = parse_chain_request()
+        frame = get_chain_frame(instrument_key, expiry_date, token)
+
+        # Repeat requests against the same cached frame reuse the encoded body
+        bodies = frame[3]
+        body = bodies.get(num_strikes)
+        if body is None:
+            payload = build_chain_payload(frame, instrument_key, expiry_date, num_strikes)
+            body = bodies[num_strikes] = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+        return app.response_class(body, mimetype='application/json')
         
-        return jsonify({
-            'success': True,
-            'metrics': {
-                'spot': spot_price,
-                'atm': atm_strike,
-                'total_ce': total_ce_oi,
-                'total_pe': total_pe_oi,
-                'pcr': pcr
-            },
-            'chart': {
-                'ce_strikes': ce_df['strike'].tolist(),
-                'ce_oi': ce_df['oi'].tolist(),
-                'pe_strikes': pe_df['strike'].tolist(),
-                'pe_oi': pe_df['oi'].tolist(),
-                'instrument': instrument_name,
-                'expiry_display': expiry_display
-            },
-            'df': df.to_dict('records'),
-            'csv': csv_data
+    except Exception as e:
+        return ojsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/option-chain.csv', methods=['POST'])
+def download_option_chain_csv():
+    # CSV is only built when the user asks for it, not on every data fetch
+    try:
+        token, instrument_key, expiry_date, num_strikes = parse_chain_request()
+        frame = get_chain_frame(instrument_key, expiry_date, token)
+        df, spot_price, _ = select_strike_window(frame, num_strikes)
+        # The frame carries spot as a scalar; the CSV keeps its per-row underlying column
+        df = df.assign(underlying=spot_price)
+
+        # Stream the CSV in row chunks so the full file is never held in memory
+        def generate(chunksize=1000):
+            yield df.iloc[:0].to_csv(index=False)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize].to_csv(index=False, header=False)
+
+        return Response(generate(), mimetype='text/csv', headers={
+            'Content-Disposition': f'attachment; filename=option_chain_{expiry_date}.csv'
         })
-        
+
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return ojsonify({'success': False, 'error': str(e)})
 
 @app.route('/health')
 def health():
-    return jsonify({'status': 'healthy'})
+    return ojsonify({'status': 'healthy'})
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))